@@ -30,6 +30,7 @@ for more details.
 import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from functools import lru_cache
 from weakref import WeakKeyDictionary
 
 #
@@ -40,6 +41,18 @@ from weakref import WeakKeyDictionary
 #
 
 
+@lru_cache(maxsize=128)
+def _compile_pattern(pattern, flags=0):
+    """
+    Compile a criteria regular expression.
+
+    This is cached separately from the re module's internal
+    cache, so criteria which are set repeatedly (e.g. when
+    rerunning a query) are not evicted by unrelated regexes.
+    """
+    return re.compile(pattern, flags)
+
+
 class CriteriaDescriptor:
 
     """
@@ -89,7 +102,7 @@ class CriteriaDescriptor:
         if not value:
             self.instances[obj] = None
         elif self.regex and getattr(obj, self.regex, False):
-            self.instances[obj] = re.compile(value)
+            self.instances[obj] = _compile_pattern(value)
         elif self.lookup_function:
             lookup = getattr(obj.policy, self.lookup_function)
             self.instances[obj] = lookup(value)
@@ -101,20 +114,25 @@ class CriteriaDescriptor:
 
 class CriteriaSetDescriptor(CriteriaDescriptor):
 
-    """Descriptor for a set of criteria."""
+    """
+    Descriptor for a set of criteria.
+
+    Non-regex criteria are stored as a frozenset, so they can be
+    used directly for set operations and membership tests.
+    """
 
     def __set__(self, obj, value):
         if not value:
             self.instances[obj] = None
         elif self.regex and getattr(obj, self.regex, False):
-            self.instances[obj] = re.compile(value)
+            self.instances[obj] = _compile_pattern(value)
         elif self.lookup_function:
             lookup = getattr(obj.policy, self.lookup_function)
-            self.instances[obj] = set(lookup(v) for v in value)
+            self.instances[obj] = frozenset(lookup(v) for v in value)
         elif self.enum_class:
-            self.instances[obj] = set(self.enum_class.lookup(v) for v in value)
+            self.instances[obj] = frozenset(self.enum_class.lookup(v) for v in value)
         else:
-            self.instances[obj] = set(value)
+            self.instances[obj] = frozenset(value)
 
 
 #
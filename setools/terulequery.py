@@ -141,32 +141,54 @@ class TERuleQuery(mixins.MatchObjClass, mixins.MatchPermission, query.PolicyQuer
         self.log.debug("Boolean: {0.boolean!r}, eq: {0.boolean_equal}, "
                        "regex: {0.boolean_regex}".format(self))
 
+        # The criteria matched in this loop are constant for the query,
+        # so read them once here rather than once per rule.  Most are
+        # descriptors, which each cost a dictionary lookup.  The object
+        # class and standard permission matching is done by the mixin
+        # methods, which read their own criteria.
+        ruletype = self.ruletype
+        source = self.source
+        source_indirect = self.source_indirect
+        source_regex = self.source_regex
+        target = self.target
+        target_indirect = self.target_indirect
+        target_regex = self.target_regex
+        perms = self.perms
+        perms_equal = self.perms_equal
+        xperms = self.xperms
+        xperms_equal = self.xperms_equal
+        default = self.default
+        default_regex = self.default_regex
+        boolean = self.boolean
+        boolean_equal = self.boolean_equal
+        boolean_regex = self.boolean_regex
+
         for rule in self.policy.terules():
             #
             # Matching on rule type
             #
-            if self.ruletype:
-                if rule.ruletype not in self.ruletype:
+            if ruletype:
+                if rule.ruletype not in ruletype:
                     continue
 
             #
             # Matching on source type
             #
-            if self.source and not match_indirect_regex(
+            if source and not match_indirect_regex(
                     rule.source,
-                    self.source,
-                    self.source_indirect,
-                    self.source_regex):
+                    source,
+                    source_indirect,
+                    source_regex):
                 continue
 
             #
             # Matching on target type
             #
-            if self.target and not match_indirect_regex(
+            if target and not match_indirect_regex(
                     rule.target,
-                    self.target,
-                    self.target_indirect,
-                    self.target_regex):
+                    target,
+                    target_indirect,
+                    target_regex):
                 continue
 
             #
@@ -179,14 +201,14 @@ class TERuleQuery(mixins.MatchObjClass, mixins.MatchPermission, query.PolicyQuer
             # Matching on permission set
             #
             try:
-                if self.perms and rule.extended:
-                    if self.perms_equal and len(self.perms) > 1:
+                if perms and rule.extended:
+                    if perms_equal and len(perms) > 1:
                         # if criteria is more than one standard permission,
                         # extended perm rules can never match if the
                         # permission set equality option is on.
                         continue
 
-                    if rule.xperm_type not in self.perms:
+                    if rule.xperm_type not in perms:
                         continue
                 elif not self._match_perms(rule):
                     continue
@@ -197,10 +219,10 @@ class TERuleQuery(mixins.MatchObjClass, mixins.MatchPermission, query.PolicyQuer
             # Matching on extended permissions
             #
             try:
-                if self.xperms and not match_regex_or_set(
+                if xperms and not match_regex_or_set(
                         rule.perms,
-                        self.xperms,
-                        self.xperms_equal,
+                        xperms,
+                        xperms_equal,
                         False):
                     continue
 
@@ -210,16 +232,16 @@ class TERuleQuery(mixins.MatchObjClass, mixins.MatchPermission, query.PolicyQuer
             #
             # Matching on default type
             #
-            if self.default:
+            if default:
                 try:
                     # because default type is always a single
                     # type, hard-code indirect to True
                     # so the criteria can be an attribute
                     if not match_indirect_regex(
                             rule.default,
-                            self.default,
+                            default,
                             True,
-                            self.default_regex):
+                            default_regex):
                         continue
                 except RuleUseError:
                     continue
@@ -227,13 +249,13 @@ class TERuleQuery(mixins.MatchObjClass, mixins.MatchPermission, query.PolicyQuer
             #
             # Match on Boolean in conditional expression
             #
-            if self.boolean:
+            if boolean:
                 try:
                     if not match_regex_or_set(
                             rule.conditional.booleans,
-                            self.boolean,
-                            self.boolean_equal,
-                            self.boolean_regex):
+                            boolean,
+                            boolean_equal,
+                            boolean_regex):
                         continue
                 except RuleNotConditional:
                     continue
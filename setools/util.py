@@ -63,7 +63,8 @@ def match_in_set(obj, criteria, regex):
     """
 
     if regex:
-        return [m for m in obj if criteria.search(str(m))]
+        search = criteria.search
+        return [m for m in obj if search(str(m))]
     else:
         return criteria in obj
 
@@ -82,7 +83,8 @@ def match_indirect_regex(obj, criteria, indirect, regex):
 
     if indirect:
         if regex:
-            return [o for o in obj.expand() if criteria.search(str(o))]
+            search = criteria.search
+            return [o for o in obj.expand() if search(str(o))]
         else:
             return set(criteria.expand()).intersection(obj.expand())
     else:
@@ -106,7 +108,10 @@ def match_regex_or_set(obj, criteria, equal, regex):
     """
 
     if regex:
-        return [m for m in obj if criteria.search(str(m))]
+        search = criteria.search
+        return [m for m in obj if search(str(m))]
+    elif isinstance(criteria, (set, frozenset)):
+        return match_set(obj, criteria, equal)
     else:
         return match_set(obj, set(criteria), equal)
 
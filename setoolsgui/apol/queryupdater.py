@@ -16,6 +16,8 @@
 # License along with SETools.  If not, see
 # <http://www.gnu.org/licenses/>.
 #
+import time
+
 from PyQt5.QtCore import pyqtSignal, QObject, QThread
 
 
@@ -28,38 +30,70 @@ class QueryResultsUpdater(QObject):
     query       The query object
     model       The model for the results
 
+    Attributes:
+    emit_raw    If true, the raw_line signal is emitted.  This can be
+                set false when the raw results are not displayed.
+                Default is true.
+
     Qt signals:
     finished    (int) The update has completed, with the number of results.
-    raw_line    (str) A string to be appended to the raw results.
+    raw_line    (str) A batch of newline-separated strings to be
+                appended to the raw results.
+    reset       The update has started and the results should be cleared.
+                This is connected to the model's clear method.
+    chunk_ready (list) A batch of results to be appended to the results.
+                This is connected to the model's extend method.
     """
 
     finished = pyqtSignal(int)
     raw_line = pyqtSignal(str)
+    reset = pyqtSignal()
+    chunk_ready = pyqtSignal(object)
 
     def __init__(self, query, model):
         super(QueryResultsUpdater, self).__init__()
         self.query = query
         self.model = model
+        self.emit_raw = True
+
+        # the model is updated in the GUI thread, via queued signals.
+        self.reset.connect(self.model.clear)
+        self.chunk_ready.connect(self.model.extend)
 
     def update(self):
         """Run the query and update results."""
-        self.model.beginResetModel()
+        self.reset.emit()
 
-        results = []
+        thread = QThread.currentThread()
+        chunk = []
         counter = 0
+        next_check = time.monotonic() + 0.05
 
         for counter, item in enumerate(self.query.results(), start=1):
-            results.append(item)
+            chunk.append(item)
 
-            self.raw_line.emit(str(item))
+            if not counter % 500:
+                # update results in batches of 500
+                self._emit_chunk(chunk)
+                chunk = []
+
+            if time.monotonic() >= next_check:
+                # check for interruption and yield
+                # execution every 50ms
+                if thread.isInterruptionRequested():
+                    break
 
-            if QThread.currentThread().isInterruptionRequested():
-                break
-            elif not counter % 10:
-                # yield execution every 10 rules
                 QThread.yieldCurrentThread()
+                next_check = time.monotonic() + 0.05
 
-        self.model.resultlist = results
-        self.model.endResetModel()
+        if chunk:
+            self._emit_chunk(chunk)
 
         self.finished.emit(counter)
+
+    def _emit_chunk(self, chunk):
+        """Send a batch of results to the model and raw results."""
+        self.chunk_ready.emit(chunk)
+
+        if self.emit_raw:
+            self.raw_line.emit("\n".join(map(str, chunk)))
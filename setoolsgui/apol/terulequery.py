@@ -18,14 +18,17 @@
 #
 
 import logging
+from collections import namedtuple
+from weakref import WeakKeyDictionary
 
-from PyQt5.QtCore import Qt, QSortFilterProxyModel, QStringListModel, QThread
+from PyQt5.QtCore import Qt, QThread
 from PyQt5.QtGui import QPalette, QTextCursor
 from PyQt5.QtWidgets import QCompleter, QHeaderView, QMessageBox, QProgressDialog
 from setools import TERuleQuery
 
 from ..logtosignal import LogHandlerToSignal
-from ..models import PermListModel, SEToolsListModel, invert_list_selection
+from ..models import PermListModel, SEToolsListModel, SortedStringListModel, \
+    invert_list_selection
 from ..terulemodel import TERuleTableModel
 from .analysistab import AnalysisTab
 from .exception import TabFieldError
@@ -33,11 +36,55 @@ from .queryupdater import QueryResultsUpdater
 from .workspace import load_checkboxes, load_lineedits, load_listviews, load_textedits, \
     save_checkboxes, save_lineedits, save_listviews, save_textedits
 
+policy_lists = namedtuple("policy_lists", ["types", "typeattrs"])
+
+# Sorted policy names used for autocompletion, per policy.  Only
+# strings are cached, so the cached values do not reference the
+# policy, and the weak references let closed policies be garbage
+# collected.
+_policy_lists_cache = WeakKeyDictionary()
+
+
+def _policy_lists(policy):
+    """
+    Return the policy_lists for the policy.  The policy's types and
+    attributes are only walked once; later tabs on the same policy
+    reuse the lists.
+
+    Fields:
+    types       Case-insensitively sorted tuple of type names.
+    typeattrs   Case-insensitively sorted tuple of type and
+                attribute names.
+    """
+    try:
+        return _policy_lists_cache[policy]
+    except KeyError:
+        types = sorted(map(str, policy.types()), key=str.lower)
+        attrs = sorted(map(str, policy.typeattributes()), key=str.lower)
+        # the sort merges the two already-sorted runs in linear time
+        lists = policy_lists(tuple(types), tuple(sorted(types + attrs, key=str.lower)))
+        _policy_lists_cache[policy] = lists
+        return lists
+
 
 class TERuleQueryTab(AnalysisTab):
 
     """A Type Enforcement rule query."""
 
+    # The rule types, and the policy attribute with each rule type's
+    # count.  The rule type checkboxes are named after the rule type.
+    _ruletypes = (("allow", "allow_count"),
+                  ("allowxperm", "allowxperm_count"),
+                  ("auditallow", "auditallow_count"),
+                  ("auditallowxperm", "auditallowxperm_count"),
+                  ("neverallow", "neverallow_count"),
+                  ("neverallowxperm", "neverallowxperm_count"),
+                  ("dontaudit", "dontaudit_count"),
+                  ("dontauditxperm", "dontauditxperm_count"),
+                  ("type_transition", "type_transition_count"),
+                  ("type_member", "type_member_count"),
+                  ("type_change", "type_change_count"))
+
     def __init__(self, parent, policy, perm_map):
         super(TERuleQueryTab, self).__init__(parent)
         self.log = logging.getLogger(__name__)
@@ -50,32 +97,45 @@ class TERuleQueryTab(AnalysisTab):
         self.thread.wait(5000)
         logging.getLogger("setools.terulequery").removeHandler(self.handler)
 
+    def closeEvent(self, event):
+        # release the results kept for generating the raw results
+        self.raw_results_pending = None
+        super(TERuleQueryTab, self).closeEvent(event)
+
     def setupUi(self):
         self.load_ui("apol/terulequery.ui")
 
+        self._ruletype_widgets = dict((r, getattr(self, r)) for r, _ in self._ruletypes)
+
+        lists = _policy_lists(self.policy)
+
         # set up source/target autocompletion
-        typeattr_completion_list = [str(t) for t in self.policy.types()]
-        typeattr_completion_list.extend(str(a) for a in self.policy.typeattributes())
-        typeattr_completer_model = QStringListModel(self)
-        typeattr_completer_model.setStringList(sorted(typeattr_completion_list))
+        typeattr_completer_model = SortedStringListModel(self, lists.typeattrs)
         self.typeattr_completion = QCompleter()
         self.typeattr_completion.setModel(typeattr_completer_model)
+        self.typeattr_completion.setModelSorting(QCompleter.CaseInsensitivelySortedModel)
+        self.typeattr_completion.setCaseSensitivity(Qt.CaseInsensitive)
+        self.typeattr_completion.setFilterMode(Qt.MatchStartsWith)
         self.source.setCompleter(self.typeattr_completion)
         self.target.setCompleter(self.typeattr_completion)
 
         # set up default autocompletion
-        type_completion_list = [str(t) for t in self.policy.types()]
-        type_completer_model = QStringListModel(self)
-        type_completer_model.setStringList(sorted(type_completion_list))
+        type_completer_model = SortedStringListModel(self, lists.types)
         self.type_completion = QCompleter()
         self.type_completion.setModel(type_completer_model)
+        self.type_completion.setModelSorting(QCompleter.CaseInsensitivelySortedModel)
+        self.type_completion.setCaseSensitivity(Qt.CaseInsensitive)
+        self.type_completion.setFilterMode(Qt.MatchStartsWith)
         self.default_type.setCompleter(self.type_completion)
 
         # setup indications of errors on source/target/default
         self.errors = set()
         self.orig_palette = self.source.palette()
-        self.error_palette = self.source.palette()
-        self.error_palette.setColor(QPalette.Base, Qt.red)
+        if TERuleQueryTab.error_palette is None:
+            # the error palette is shared by all TE rule query tabs
+            error_palette = QPalette(self.orig_palette)
+            error_palette.setColor(QPalette.Base, Qt.red)
+            TERuleQueryTab.error_palette = error_palette
         self.clear_source_error()
         self.clear_target_error()
         self.clear_default_error()
@@ -97,16 +157,24 @@ class TERuleQueryTab(AnalysisTab):
 
         # set up results
         self.table_results_model = TERuleTableModel(self)
-        self.sort_proxy = QSortFilterProxyModel(self)
-        self.sort_proxy.setSourceModel(self.table_results_model)
-        self.table_results.setModel(self.sort_proxy)
+        self.table_results.setModel(self.table_results_model)
         self.table_results.sortByColumn(0, Qt.AscendingOrder)
 
+        # Only sample rows when sizing columns to their contents, and
+        # use a uniform row height rather than measuring every row.
+        # Text is elided rather than wrapped, since rows are one line
+        # high; the full text is available in the cell's tooltip.
+        self.table_results.horizontalHeader().setResizeContentsPrecision(100)
+        self.table_results.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_results.setWordWrap(False)
+
         # set up processing thread
         self.thread = QThread()
         self.worker = QueryResultsUpdater(self.query, self.table_results_model)
         self.worker.moveToThread(self.thread)
         self.worker.raw_line.connect(self.raw_results.appendPlainText)
+        self.raw_results_stale = False
+        self.raw_results_pending = None
         self.worker.finished.connect(self.update_complete)
         self.worker.finished.connect(self.thread.quit)
         self.thread.started.connect(self.worker.update)
@@ -156,23 +224,21 @@ class TERuleQueryTab(AnalysisTab):
         self.default_type.editingFinished.connect(self.set_default_type)
         self.default_regex.toggled.connect(self.set_default_regex)
         self.bool_criteria.selectionModel().selectionChanged.connect(self.set_bools)
+        self.results_frame.currentChanged.connect(self.update_raw_results)
 
     #
     # Ruletype criteria
     #
 
     def _set_ruletypes(self, value):
-        self.allow.setChecked(value)
-        self.allowxperm.setChecked(value)
-        self.auditallow.setChecked(value)
-        self.auditallowxperm.setChecked(value)
-        self.neverallow.setChecked(value)
-        self.neverallowxperm.setChecked(value)
-        self.dontaudit.setChecked(value)
-        self.dontauditxperm.setChecked(value)
-        self.type_transition.setChecked(value)
-        self.type_member.setChecked(value)
-        self.type_change.setChecked(value)
+        # block the checkboxes' signals so the xperm
+        # criteria are only updated once, at the end.
+        for checkbox in self._ruletype_widgets.values():
+            blocked = checkbox.blockSignals(True)
+            checkbox.setChecked(value)
+            checkbox.blockSignals(blocked)
+
+        self.toggle_xperm_criteria()
 
     def set_all_ruletypes(self):
         self._set_ruletypes(True)
@@ -225,9 +291,8 @@ class TERuleQueryTab(AnalysisTab):
     #
 
     def set_tclass(self):
-        selected_classes = []
-        for index in self.tclass.selectionModel().selectedIndexes():
-            selected_classes.append(self.class_model.data(index, Qt.UserRole))
+        rows = [index.row() for index in self.tclass.selectionModel().selectedIndexes()]
+        selected_classes = self.class_model.items_at(rows)
 
         self.query.tclass = selected_classes
         self.perms_model.set_classes(selected_classes)
@@ -240,11 +305,8 @@ class TERuleQueryTab(AnalysisTab):
     #
 
     def set_perms(self):
-        selected_perms = []
-        for index in self.perms.selectionModel().selectedIndexes():
-            selected_perms.append(self.perms_model.data(index, Qt.UserRole))
-
-        self.query.perms = selected_perms
+        rows = [index.row() for index in self.perms.selectionModel().selectedIndexes()]
+        self.query.perms = self.perms_model.items_at(rows)
 
     def invert_perms_selection(self):
         invert_list_selection(self.perms.selectionModel())
@@ -317,11 +379,8 @@ class TERuleQueryTab(AnalysisTab):
     #
 
     def set_bools(self):
-        selected_bools = []
-        for index in self.bool_criteria.selectionModel().selectedIndexes():
-            selected_bools.append(self.bool_model.data(index, Qt.UserRole))
-
-        self.query.boolean = selected_bools
+        rows = [index.row() for index in self.bool_criteria.selectionModel().selectedIndexes()]
+        self.query.boolean = self.bool_model.items_at(rows)
 
     #
     # Save/Load tab
@@ -376,39 +435,10 @@ class TERuleQueryTab(AnalysisTab):
         rule_types = []
         max_results = 0
 
-        if self.allow.isChecked():
-            rule_types.append("allow")
-            max_results += self.policy.allow_count
-        if self.allowxperm.isChecked():
-            rule_types.append("allowxperm")
-            max_results += self.policy.allowxperm_count
-        if self.auditallow.isChecked():
-            rule_types.append("auditallow")
-            max_results += self.policy.auditallow_count
-        if self.auditallowxperm.isChecked():
-            rule_types.append("auditallowxperm")
-            max_results += self.policy.auditallowxperm_count
-        if self.neverallow.isChecked():
-            rule_types.append("neverallow")
-            max_results += self.policy.neverallow_count
-        if self.neverallowxperm.isChecked():
-            rule_types.append("neverallowxperm")
-            max_results += self.policy.neverallowxperm_count
-        if self.dontaudit.isChecked():
-            rule_types.append("dontaudit")
-            max_results += self.policy.dontaudit_count
-        if self.dontauditxperm.isChecked():
-            rule_types.append("dontauditxperm")
-            max_results += self.policy.dontauditxperm_count
-        if self.type_transition.isChecked():
-            rule_types.append("type_transition")
-            max_results += self.policy.type_transition_count
-        if self.type_member.isChecked():
-            rule_types.append("type_member")
-            max_results += self.policy.type_member_count
-        if self.type_change.isChecked():
-            rule_types.append("type_change")
-            max_results += self.policy.type_change_count
+        for ruletype, count in self._ruletypes:
+            if self._ruletype_widgets[ruletype].isChecked():
+                rule_types.append(ruletype)
+                max_results += getattr(self.policy, count)
 
         self.query.ruletype = rule_types
         self.query.source_indirect = self.source_indirect.isChecked()
@@ -433,27 +463,51 @@ class TERuleQueryTab(AnalysisTab):
         self.busy.setLabelText("Processing query...")
         self.busy.show()
         self.raw_results.clear()
+
+        # Only generate the raw results while they are displayed.
+        # Otherwise they are generated from the table results if
+        # the raw results are displayed later.
+        self.worker.emit_raw = self.raw_results.isVisible()
+        self.raw_results_stale = not self.worker.emit_raw
+        self.raw_results_pending = None
+
         self.thread.start()
 
+    def update_raw_results(self):
+        """Generate the raw results from the query's results, if needed."""
+        # the pending results are only set once the query is complete
+        if self.raw_results_stale and self.raw_results_pending is not None \
+                and self.raw_results.isVisible():
+
+            self.busy.setLabelText("Generating the raw results; GUI may be unresponsive")
+            self.busy.show()
+            self.busy.repaint()
+            self.raw_results.setPlainText("\n".join(map(str, self.raw_results_pending)))
+            self.raw_results_stale = False
+            self.raw_results_pending = None
+            self.busy.reset()
+
     def update_complete(self, count):
         self.log.info("{0} type enforcement rule(s) found.".format(count))
 
+        # The raw results are in query order.  If they will be generated
+        # later, keep the results in that order before the table is sorted.
+        if self.raw_results_stale:
+            self.raw_results_pending = list(self.table_results_model.resultlist)
+
+        # results are appended as they are found, so sort them now
+        header = self.table_results.horizontalHeader()
+        self.table_results.sortByColumn(header.sortIndicatorSection(),
+                                        header.sortIndicatorOrder())
+
         # update sizes/location of result displays
         if not self.busy.wasCanceled():
-            self.busy.setLabelText("Resizing the result table's columns; GUI may be unresponsive")
-            self.busy.repaint()
             self.table_results.resizeColumnsToContents()
             # If the permissions column width is too long, pull back
             # to a reasonable size
-            header = self.table_results.horizontalHeader()
             if header.sectionSize(4) > 400:
                 header.resizeSection(4, 400)
 
-        if not self.busy.wasCanceled():
-            self.busy.setLabelText("Resizing the result table's rows; GUI may be unresponsive")
-            self.busy.repaint()
-            self.table_results.resizeRowsToContents()
-
         if not self.busy.wasCanceled():
             self.busy.setLabelText("Moving the raw result to top; GUI may be unresponsive")
             self.busy.repaint()
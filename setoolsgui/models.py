@@ -19,8 +19,8 @@
 import logging
 from contextlib import suppress
 
-from PyQt5.QtCore import QAbstractListModel, QItemSelectionModel, QAbstractTableModel, \
-    QModelIndex, QStringListModel, Qt
+from PyQt5.QtCore import QAbstractListModel, QItemSelection, QItemSelectionModel, \
+    QAbstractTableModel, QModelIndex, QStringListModel, Qt
 from setools.exception import NoCommon
 
 
@@ -29,9 +29,11 @@ def invert_list_selection(selection_model):
 
     model = selection_model.model()
     rowcount = model.rowCount()
-    for row in range(rowcount):
-        index = model.createIndex(row, 0)
-        selection_model.select(index, QItemSelectionModel.Toggle)
+    if rowcount:
+        # toggle all rows in one selection so only one
+        # selectionChanged signal is emitted.
+        selection = QItemSelection(model.index(0, 0), model.index(rowcount - 1, 0))
+        selection_model.select(selection, QItemSelectionModel.Toggle)
 
 
 class SEToolsListModel(QAbstractListModel):
@@ -88,6 +90,11 @@ class SEToolsListModel(QAbstractListModel):
             del self.item_list[row]
             self.endRemoveRows()
 
+    def items_at(self, rows):
+        """Return a list of the items at the specified rows."""
+        item_list = self.item_list
+        return [item_list[r] for r in rows]
+
     def data(self, index, role):
         if self.item_list and index.isValid():
             row = index.row()
@@ -99,6 +106,43 @@ class SEToolsListModel(QAbstractListModel):
                 return item
 
 
+class SortedStringListModel(QAbstractListModel):
+
+    """
+    A read-only list model of strings, for use with
+    QCompleter.  The strings must already be sorted
+    case-insensitively, e.g. sorted(names, key=str.lower),
+    so the completer can be set to
+    QCompleter.CaseInsensitivelySortedModel and use
+    a binary search rather than a linear scan.
+    The model does not sort the strings itself.
+    """
+
+    def __init__(self, parent, string_list=()):
+        super(SortedStringListModel, self).__init__(parent)
+        self.string_list = string_list
+
+    @property
+    def string_list(self):
+        return self._string_list
+
+    @string_list.setter
+    def string_list(self, string_list):
+        self.beginResetModel()
+        self._string_list = tuple(string_list)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._string_list)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self._string_list[index.row()]
+
+
 class PermListModel(SEToolsListModel):
 
     """
@@ -157,5 +201,19 @@ class SEToolsTableModel(QAbstractTableModel):
     def columnCount(self, parent=QModelIndex()):
         return len(self.headers)
 
+    def clear(self):
+        """Remove all results."""
+        self.beginResetModel()
+        self.resultlist = []
+        self.endResetModel()
+
+    def extend(self, results):
+        """Append the results to the end of the list."""
+        if results:
+            row = len(self.resultlist)
+            self.beginInsertRows(QModelIndex(), row, row + len(results) - 1)
+            self.resultlist.extend(results)
+            self.endInsertRows()
+
     def data(self, index, role):
         raise NotImplementedError
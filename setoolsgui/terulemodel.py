@@ -29,39 +29,70 @@ class TERuleTableModel(SEToolsTableModel):
     headers = ["Rule Type", "Source", "Target", "Object Class", "Permissions/Default Type",
                "Conditional Expression", "Conditional Block"]
 
+    def _display(self, rule, col):
+        """Return the display text of the rule for the column."""
+        if col == 0:
+            return rule.ruletype.name
+        elif col == 1:
+            return rule.source.name
+        elif col == 2:
+            return rule.target.name
+        elif col == 3:
+            return rule.tclass.name
+        elif col == 4:
+            try:
+                if rule.extended:
+                    return "{0.xperm_type}: {0.perms:,}".format(rule)
+                else:
+                    return ", ".join(sorted(rule.perms))
+            except RuleUseError:
+                return rule.default.name
+        elif col == 5:
+            try:
+                return str(rule.conditional)
+            except RuleNotConditional:
+                return None
+        elif col == 6:
+            try:
+                return str(rule.conditional_block)
+            except RuleNotConditional:
+                return None
+
     def data(self, index, role):
         if self.resultlist and index.isValid():
             row = index.row()
             col = index.column()
             rule = self.resultlist[row]
 
-            if role == Qt.DisplayRole:
-                if col == 0:
-                    return rule.ruletype.name
-                elif col == 1:
-                    return rule.source.name
-                elif col == 2:
-                    return rule.target.name
-                elif col == 3:
-                    return rule.tclass.name
-                elif col == 4:
-                    try:
-                        if rule.extended:
-                            return "{0.xperm_type}: {0.perms:,}".format(rule)
-                        else:
-                            return ", ".join(sorted(rule.perms))
-                    except RuleUseError:
-                        return rule.default.name
-                elif col == 5:
-                    try:
-                        return str(rule.conditional)
-                    except RuleNotConditional:
-                        return None
-                elif col == 6:
-                    try:
-                        return str(rule.conditional_block)
-                    except RuleNotConditional:
-                        return None
-
+            if role in (Qt.DisplayRole, Qt.ToolTipRole):
+                return self._display(rule, col)
             elif role == Qt.UserRole:
                 return rule
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sort the rules by the column's display text.
+
+        This is done on the result list directly, so the key is
+        computed once per rule, rather than using a sort proxy,
+        which calls data() for each comparison.
+        """
+        if not self.resultlist or not 0 <= column < len(self.headers):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+
+        keys = [self._display(rule, column) or "" for rule in self.resultlist]
+        rows = sorted(range(len(keys)), key=keys.__getitem__,
+                      reverse=(order == Qt.DescendingOrder))
+        self.resultlist = [self.resultlist[r] for r in rows]
+
+        # update persistent indexes, e.g. the view's selection
+        persistent = self.persistentIndexList()
+        if persistent:
+            new_rows = dict((old, new) for new, old in enumerate(rows))
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(new_rows[i.row()], i.column()) for i in persistent])
+
+        self.layoutChanged.emit()